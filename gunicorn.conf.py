@@ -0,0 +1,58 @@
+# Configuration gunicorn pour la production :
+#   flask --app main init-db
+#   gunicorn -c gunicorn.conf.py
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+# Métriques Prometheus partagées entre workers : à définir avant le chargement de l'application
+prometheus_dir = os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "gmao-prometheus")
+)
+shutil.rmtree(prometheus_dir, ignore_errors=True)
+os.makedirs(prometheus_dir, exist_ok=True)
+
+wsgi_app = "main:create_app()"
+
+bind = os.getenv("GMAO_BIND", "0.0.0.0:8000")
+
+# Workers gthread : chaque worker traite plusieurs requêtes en parallèle (I/O base de données).
+# Chaque worker ouvre son propre pool SQLAlchemy (GMAO_DB_POOL_SIZE + GMAO_DB_MAX_OVERFLOW) :
+# prévoir au moins autant de connexions en pool que de threads.
+workers = int(os.getenv("GMAO_WORKERS", min(multiprocessing.cpu_count() * 2 + 1, 8)))
+worker_class = "gthread"
+threads = int(os.getenv("GMAO_THREADS", "4"))
+
+timeout = int(os.getenv("GMAO_WORKER_TIMEOUT", "60"))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle les workers régulièrement pour borner la mémoire
+max_requests = int(os.getenv("GMAO_MAX_REQUESTS", "2000"))
+max_requests_jitter = 200
+
+# L'application est chargée une fois dans le maître puis partagée entre les workers forkés.
+# Les moteurs SQLAlchemy (et leurs pools) existent donc déjà dans le maître : post_fork
+# les réinitialise dans chaque worker pour qu'aucune connexion héritée ne soit partagée.
+preload_app = True
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.getenv("GMAO_LOG_LEVEL", "info")
+
+
+def post_fork(server, worker):
+    # close=False : les connexions éventuellement ouvertes par le maître restent à lui,
+    # le worker repart sur des pools vides
+    from main import db
+    app = server.app.wsgi()
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+
+def child_exit(server, worker):
+    # Les jauges "livesum" (pool de connexions) ne doivent plus compter un worker arrêté
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)